@@ -1,101 +1,195 @@
 
+import os
 import streamlit as st
+import altair as alt
 import pandas as pd
 import numpy as np
-
-# Load Data
-df = pd.read_csv("ENG vs IND Full Series.csv")
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from kernels import group_reduce
+
+# Load Data (Parquet copy of the CSV, see csv_to_parquet.py; only the columns used below are read)
+COLUMNS = [
+    'battingPlayer', 'bowlerPlayer', 'bowlingTypeId', 'overNumber', 'runsScored',
+    'battingFeetId', 'lengthTypeId', 'lineTypeId', 'battingConnectionId',
+    'battingShotTypeId', 'bowlingDetailId', 'inningNumber', 'appealDismissalTypeId'
+]
+
+CATEGORY_COLUMNS = [
+    'battingFeetId', 'lengthTypeId', 'lineTypeId', 'bowlingTypeId', 'battingConnectionId',
+    'battingShotTypeId', 'bowlingDetailId', 'battingPlayer', 'bowlerPlayer', 'appealDismissalTypeId'
+]
+SAFE_CONNECTIONS = ['welltimed', 'middled', 'left', 'blank', 'nan']
+
+# cache_resource hands every rerun the same frame instead of unpickling a fresh copy, as
+# cache_data would; nothing below mutates it (filtering returns new frames)
+@st.cache_resource(show_spinner=True)
+def load_data(path, data_version):
+    df = pd.read_parquet(path, columns=COLUMNS, engine="pyarrow")
+    # astype('category') sorts the categories, so player option lists can be read straight off them
+    for col in CATEGORY_COLUMNS:
+        df[col] = df[col].astype('category')
+    # Downcast small-range numerics; runsScored stays nullable so missing balls aren't counted
+    df['runsScored'] = pd.to_numeric(df['runsScored'], errors='coerce').astype('Int8')
+    df['overNumber'] = df['overNumber'].astype('int16')
+    df['inningNumber'] = df['inningNumber'].astype('int8')
+    # Normalize battingConnectionId once (strip/lower, missing -> 'nan') into a category whose
+    # safe values come first, so false shots (strict to red zone only) are simply the higher codes
+    conn = df['battingConnectionId'].cat
+    normalized = conn.categories.str.strip().str.lower()
+    categories = SAFE_CONNECTIONS + sorted(set(normalized) - set(SAFE_CONNECTIONS))
+    lookup = np.append(pd.Index(categories).get_indexer(normalized), categories.index('nan'))
+    df['battingConnectionNorm'] = pd.Categorical.from_codes(lookup[conn.codes.to_numpy()], categories=categories)
+    df['is_false_shot'] = (df['battingConnectionNorm'].cat.codes >= len(SAFE_CONNECTIONS)).astype('int8')
+    return df
+
+# Every cached step, load_data included, is keyed on the data file's mtime, so replacing the
+# Parquet file reloads it instead of serving the old frame
+DATA_PATH = "ENG vs IND Full Series.parquet"
+data_version = os.path.getmtime(DATA_PATH)
+df = load_data(DATA_PATH, data_version)
+
+# Cached helpers below take the frame as _df (a leading underscore stops Streamlit hashing it)
+# and rely on data_version to tell frames apart
+@st.cache_data
+def sidebar_options(_df, data_version):
+    return {
+        'batters': tuple(_df['battingPlayer'].cat.categories),
+        'bowlers': tuple(_df['bowlerPlayer'].cat.categories),
+        'bowl_types': tuple(_df['bowlingTypeId'].dropna().unique()),
+        'max_over': int(_df['overNumber'].max())
+    }
+
+options = sidebar_options(df, data_version)
 
 # Sidebar Filters
 st.sidebar.header("Filters")
 
-batting_filter = st.sidebar.multiselect("Select Batter(s)", df['battingPlayer'].dropna().unique())
-bowling_type_filter = st.sidebar.multiselect("Select Bowling Type", df['bowlingTypeId'].dropna().unique())
-bowler_filter = st.sidebar.multiselect("Select Bowler(s)", df['bowlerPlayer'].dropna().unique())
-max_over = int(df['overNumber'].max())
+batting_filter = st.sidebar.multiselect("Select Batter(s)", options['batters'])
+bowling_type_filter = st.sidebar.multiselect("Select Bowling Type", options['bowl_types'])
+bowler_filter = st.sidebar.multiselect("Select Bowler(s)", options['bowlers'])
+max_over = options['max_over']
 over_filter = st.sidebar.slider("Select Over Range", 0, max_over, (0, max_over))
 
-# Apply Filters
-filtered_df = df.copy()
-if batting_filter:
-    filtered_df = filtered_df[filtered_df['battingPlayer'].isin(batting_filter)]
-if bowling_type_filter:
-    filtered_df = filtered_df[filtered_df['bowlingTypeId'].isin(bowling_type_filter)]
-if bowler_filter:
-    filtered_df = filtered_df[filtered_df['bowlerPlayer'].isin(bowler_filter)]
-filtered_df = filtered_df[(filtered_df['overNumber'] >= over_filter[0]) & (filtered_df['overNumber'] <= over_filter[1])]
-
-# Correct False Shot % Calculation (strict to red zone only)
-def false_shot_percentage(df):
-    safe_values = ['welltimed', 'middled', 'left', 'blank', 'nan']
-    df_conn = df['battingConnectionId'].fillna('nan').astype(str).str.strip().str.lower()
-    false_shots = df_conn[~df_conn.isin(safe_values)]
-    total_balls = df_conn.shape[0]
-    return round((len(false_shots) / total_balls) * 100, 2) if total_balls > 0 else 0
-
-# Stats table function
-def create_stats_table(df, group_col):
-    table = df.groupby(group_col).agg(
-        Total_Runs=('runsScored', 'sum'),
-        Balls_Faced=('runsScored', 'count')
-    ).reset_index()
+# Arrow copy of the frame for filtering; Arrow tables are immutable, so one shared instance is safe
+@st.cache_resource
+def load_table(_df, data_version):
+    return pa.Table.from_pandas(_df, preserve_index=False)
+
+tbl = load_table(df, data_version)
+
+# Apply Filters (cached per filter selection; tuples keep the arguments hashable)
+@st.cache_data(max_entries=8)
+def apply_filters(_tbl, data_version, batting_players, bowling_types, bowlers, over_range):
+    # Evaluate one Arrow predicate over the columns and only convert the matching rows to pandas
+    overs = _tbl['overNumber']
+    mask = pc.and_(pc.greater_equal(overs, over_range[0]), pc.less_equal(overs, over_range[1]))
+    for col, values in (('battingPlayer', batting_players), ('bowlingTypeId', bowling_types), ('bowlerPlayer', bowlers)):
+        if values:
+            mask = pc.and_(mask, pc.is_in(_tbl[col], value_set=pa.array(values)))
+    return _tbl.filter(mask).to_pandas()
+
+filtered_df = apply_filters(tbl, data_version, tuple(batting_filter), tuple(bowling_type_filter), tuple(bowler_filter), tuple(over_filter))
+
+# Totals for each observed combination of the (categorical) group columns, for several
+# groupings at once: every grouping's codes are offset into one group space for a single pass
+def group_totals(df, groupings):
+    codes = np.empty((len(groupings), len(df)), np.int64)
+    indexes = []
+    offset = 0
+    for k, group_cols in enumerate(groupings):
+        cats = [df[col].cat for col in group_cols]
+        key = np.zeros(len(df), np.int64)
+        missing = np.zeros(len(df), bool)
+        for cat in cats:
+            col_codes = cat.codes.to_numpy()
+            key = key * len(cat.categories) + col_codes
+            missing |= col_codes < 0
+        codes[k] = np.where(missing, -1, key + offset)
+        indexes.append(pd.MultiIndex.from_product([cat.categories for cat in cats], names=group_cols))
+        offset += len(indexes[-1])
+    runs = df['runsScored']
+    totals = group_reduce(
+        codes,
+        runs.to_numpy(dtype=np.int64, na_value=0),
+        runs.notna().to_numpy(dtype=np.int64),
+        df['is_false_shot'].to_numpy(dtype=np.int64),
+        offset
+    )
+    tables = []
+    offset = 0
+    for index in indexes:
+        part = totals[:, offset:offset + len(index)]
+        offset += len(index)
+        table = pd.DataFrame({'Total_Runs': part[0], 'Balls_Faced': part[1], 'False_Shots': part[2]}, index=index)
+        tables.append(table[part[3] > 0].reset_index())
+    return tables
+
+def add_rates(table):
     table['Strike_Rate'] = (table['Total_Runs'] / table['Balls_Faced'] * 100).round(2)
-    table['False_Shot_%'] = table[group_col].apply(lambda x: false_shot_percentage(df[df[group_col] == x]))
-    return table.sort_values(by='Strike_Rate', ascending=False)
+    table['False_Shot_%'] = (table.pop('False_Shots') / table['Balls_Faced'] * 100).round(2)
+    return table
+
+# Summary tables and the length x line matrix all come from one pass over filtered_df
+STATS_COLUMNS = ['battingFeetId', 'battingShotTypeId', 'bowlingDetailId', 'bowlerPlayer']
+*stats, matrix = group_totals(filtered_df, [[col] for col in STATS_COLUMNS] + [['lengthTypeId', 'lineTypeId']])
+stats_tables = {
+    col: add_rates(table).sort_values(by='Strike_Rate', ascending=False)
+    for col, table in zip(STATS_COLUMNS, stats)
+}
+matrix = add_rates(matrix)
 
 st.title("ENG vs IND Streamlit Analysis")
 
 # Table: Batting Feet ID
 st.subheader("Batting Feet ID Stats")
-st.dataframe(create_stats_table(filtered_df, 'battingFeetId'))
+st.dataframe(stats_tables['battingFeetId'])
 
 # Tabs for Matrix views
 st.subheader("LengthTypeId vs LineTypeId Matrix Views")
 tab1, tab2 = st.tabs(["Strike Rate View", "False Shot % View"])
 
-matrix = filtered_df.groupby(['lengthTypeId', 'lineTypeId']).agg(
-    Total_Runs=('runsScored', 'sum'),
-    Balls_Faced=('runsScored', 'count')
-).reset_index()
-matrix['Strike_Rate'] = (matrix['Total_Runs'] / matrix['Balls_Faced'] * 100).round(2)
-matrix['False_Shot_%'] = matrix.apply(lambda r: false_shot_percentage(
-    filtered_df[(filtered_df['lengthTypeId'] == r['lengthTypeId']) & (filtered_df['lineTypeId'] == r['lineTypeId'])]
-), axis=1)
-
-matrix_sr = matrix.pivot(index='lengthTypeId', columns='lineTypeId', values='Strike_Rate')
-matrix_fs = matrix.pivot(index='lengthTypeId', columns='lineTypeId', values='False_Shot_%')
+# Heatmaps are coloured client-side by Vega-Lite instead of building a styled HTML table
+def matrix_heatmap(matrix, value_col, scheme):
+    return alt.Chart(matrix).mark_rect().encode(
+        x='lineTypeId:O',
+        y='lengthTypeId:O',
+        color=alt.Color(f'{value_col}:Q', scale=alt.Scale(scheme=scheme)),
+        tooltip=['lengthTypeId', 'lineTypeId', 'Balls_Faced', value_col]
+    )
 
 with tab1:
     st.write("**Strike Rate (Green Gradient)**")
-    st.dataframe(matrix_sr.style.background_gradient(cmap='Greens', axis=None))
+    st.altair_chart(matrix_heatmap(matrix, 'Strike_Rate', 'greens'), width="stretch")
 
 with tab2:
     st.write("**False Shot % (Red Gradient)**")
-    st.dataframe(matrix_fs.style.background_gradient(cmap='Reds', axis=None))
+    st.altair_chart(matrix_heatmap(matrix, 'False_Shot_%', 'reds'), width="stretch")
 
 # Table: Batting Shot Type ID
 st.subheader("Batting Shot Type ID Stats")
-st.dataframe(create_stats_table(filtered_df, 'battingShotTypeId'))
+st.dataframe(stats_tables['battingShotTypeId'])
 
 # Table: Bowling Detail ID
 st.subheader("Bowling Detail ID Stats")
-st.dataframe(create_stats_table(filtered_df, 'bowlingDetailId'))
+st.dataframe(stats_tables['bowlingDetailId'])
 
 # Table: Bowler Stats
 st.subheader("Bowler Stats (bowlerPlayer)")
-st.dataframe(create_stats_table(filtered_df, 'bowlerPlayer'))
+st.dataframe(stats_tables['bowlerPlayer'])
 
 # Table: Batting Connection ID with gradient
 st.subheader("Batting Connection ID")
-connection_counts = filtered_df['battingConnectionId'].fillna('NaN').astype(str).str.strip().str.lower().value_counts().reset_index()
+connection_counts = filtered_df['battingConnectionNorm'].value_counts()
+connection_counts = connection_counts[connection_counts > 0].reset_index()
 connection_counts.columns = ['battingConnectionId', 'Count']
 
-def color_map(val):
-    if val in ['welltimed', 'middled']:
-        return 'background-color: lightgreen'
-    elif val in ['left', 'blank', 'nan']:
-        return 'background-color: khaki'
-    else:  # All others as Edged
-        return 'background-color: lightcoral'
+# Cell style per connection code: safe categories come first in SAFE_CONNECTIONS order, then edged
+CONNECTION_STYLES = np.array(
+    ['background-color: lightgreen'] * 2 + ['background-color: khaki'] * 3 + ['background-color: lightcoral']
+)
+connection_codes = connection_counts['battingConnectionId'].cat.codes.to_numpy()
+connection_styles = CONNECTION_STYLES[np.minimum(connection_codes, len(SAFE_CONNECTIONS))]
 
-st.dataframe(connection_counts.style.applymap(color_map, subset=['battingConnectionId']))
+st.dataframe(connection_counts.style.apply(lambda _: connection_styles, subset=['battingConnectionId']))
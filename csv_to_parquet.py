@@ -0,0 +1,17 @@
+import pandas as pd
+
+# Explicit column types so the Arrow CSV parser skips type inference
+DTYPES = {
+    'inningNumber': 'int64', 'overNumber': 'int64', 'ballNumber': 'int64', 'ballDateTime': 'string',
+    'battingPlayer': 'string', 'nonStrikeBattingPlayer': 'string', 'bowlerPlayer': 'string',
+    'runs': 'int64', 'runsScored': 'float64', 'runsConceded': 'float64', 'extras': 'int64',
+    'battingFeetId': 'string', 'battingConnectionId': 'string', 'battingShotTypeId': 'string',
+    'bowlingFromId': 'string', 'bowlingTypeId': 'string', 'bowlingHandId': 'string',
+    'bowlingDetailId': 'string', 'fieldingPosition': 'string', 'lengthTypeId': 'string',
+    'lineTypeId': 'string', 'referralOutcomeId': 'string', 'outcomeId': 'string',
+    'appealDismissalTypeId': 'string'
+}
+
+# One-time conversion of the source CSV to Parquet (re-run whenever the CSV changes)
+df = pd.read_csv("ENG vs IND Full Series.csv", engine="pyarrow", dtype=DTYPES)
+df.to_parquet("ENG vs IND Full Series.parquet", compression="snappy", index=False)
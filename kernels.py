@@ -0,0 +1,44 @@
+import threading
+
+import numpy as np
+from numba import config, get_num_threads, njit, prange
+
+# Numba kernels live outside app.py so Streamlit reruns (which re-execute app.py) reuse the
+# compiled code; cache=True also keeps it in __pycache__ across server restarts.
+# Streamlit launches the first parallel kernel from a script thread, not the main thread; under
+# the TBB layer (Numba's pick when TBB is installed) the process then never exits, so pin the
+# workqueue layer. Workqueue must not be entered from two threads at once, and each Streamlit
+# session runs on its own thread, hence the lock.
+config.THREADING_LAYER = 'workqueue'
+_lock = threading.Lock()
+
+# Per-group runs / balls / false shots / rows in one parallel pass. codes has one row per
+# grouping (offset into a shared group space), so several groupings share the same pass over the
+# data. Each thread sums its own slice of rows into a private row of the accumulator so the
+# scatter-adds never race.
+@njit(parallel=True, cache=True)
+def _group_reduce(codes, runs, has_runs, false_flag, n_groups, n_chunks):
+    n_keys, n_rows = codes.shape
+    chunk = (n_rows + n_chunks - 1) // n_chunks
+    acc = np.zeros((n_chunks, 4, n_groups), np.int64)
+    for t in prange(n_chunks):
+        for i in range(t * chunk, min((t + 1) * chunk, n_rows)):
+            for k in range(n_keys):
+                c = codes[k, i]
+                if c >= 0:  # -1 marks a missing group value, which groupby drops
+                    acc[t, 0, c] += runs[i]
+                    acc[t, 1, c] += has_runs[i]
+                    acc[t, 2, c] += false_flag[i]
+                    acc[t, 3, c] += 1
+    return acc.sum(axis=0)
+
+def group_reduce(codes, runs, has_runs, false_flag, n_groups):
+    with _lock:
+        # Thread count is passed in rather than read inside the kernel, which would block caching
+        return _group_reduce(codes, runs, has_runs, false_flag, n_groups, get_num_threads())
+
+# Compile (or load from the cache) at import so the first interactive query doesn't pay for it.
+# This runs on whichever thread imports kernels (a Streamlit script thread), which is safe only
+# because the workqueue layer is pinned above.
+_warm_up = np.zeros(1, np.int64)
+group_reduce(_warm_up.reshape(1, 1), _warm_up, _warm_up, _warm_up, 1)